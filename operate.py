@@ -1,10 +1,16 @@
 import os
+import json
+import asyncio
+import hashlib
+import time
+import logging
+import threading
 import typing as t
 import kopf
-import requests
+import httpx
 import kubernetes
-from copy import deepcopy
-from kubernetes import client
+from functools import lru_cache
+from kubernetes import client, watch
 from kubernetes.config import load_kube_config, load_incluster_config
 from kubernetes.client import AppsV1Api, CoreV1Api
 from kubernetes.client.exceptions import ApiException
@@ -15,16 +21,40 @@ VERSION = "v1alpha1"
 PLURAL = "hotstandbydeployments"
 
 DEFAULT_BUSY_ANN = "paia.tech/busy"
+SPEC_HASH_ANN = "hsd.paia.tech/spec-hash"
 HTTP_DEFAULTS = {
     "port": 8080,
     "path": "/busy",
     "successIsBusy": True,
     "timeoutSeconds": 1,
     "periodSeconds": 10,
+    "http2": False,
 }
+HTTP_MAX_CONNECTIONS = 128
+HTTP_MAX_KEEPALIVE = 64
+POD_WATCH_TIMEOUT = 300
+# client-side read timeout, so a half-open connection can't outlive the server-side one
+POD_WATCH_REQUEST_TIMEOUT = POD_WATCH_TIMEOUT + 30
+POD_WATCH_BACKOFF = 5
+RECONCILE_DEBOUNCE = 0.5
+PROBE_TICK = 1.0
+# the apiserver picks the first clause it supports: the List form for LIST, the item form for WATCH
+POD_META_ACCEPT = (
+    "application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,"
+    "application/json;as=PartialObjectMetadata;v=v1;g=meta.k8s.io,"
+    "application/json"
+)
+
+logger = logging.getLogger(__name__)
+
+_EMPTY: t.Dict[str, str] = {}
+
 
 @kopf.on.startup()
-def init_clients(memo: kopf.Memo, **_):
+async def init_clients(memo: kopf.Memo, settings: kopf.OperatorSettings, **_):
+    # collapse bursts of watch events on the same HSD into a single reconcile
+    settings.batching.batch_window = RECONCILE_DEBOUNCE
+
     try:
         if os.getenv("KUBERNETES_SERVICE_HOST"):
             load_incluster_config()
@@ -35,6 +65,70 @@ def init_clients(memo: kopf.Memo, **_):
 
     memo.apps: AppsV1Api = client.AppsV1Api()
     memo.v1: CoreV1Api = client.CoreV1Api()
+    # same API, but asks for PartialObjectMetadata: default headers override the generated
+    # Accept header, so pods come back as metadata-only V1Pods
+    meta_client = client.ApiClient()
+    meta_client.set_default_header("Accept", POD_META_ACCEPT)
+    memo.v1_meta: CoreV1Api = client.CoreV1Api(meta_client)
+
+    # one keep-alive pool shared by all busy probes, driven by kopf's event loop
+    memo.http = _new_http_client()
+    # h2c client for busyProbe.http.http2; created here once so every per-object copy
+    # of memo shares it. without the optional h2 package those probes use HTTP/1.1
+    try:
+        memo.http2 = _new_http_client(http2=True)
+    except ImportError:
+        logger.warning("h2 is not installed; busyProbe.http.http2 falls back to HTTP/1.1")
+        memo.http2 = None
+
+    # (namespace, frozenset(matchLabels), metadata_only) -> _PodStore fed by a background watch
+    memo.pod_cache: dict[tuple, "_PodStore"] = {}
+    memo.pod_cache_lock = threading.Lock()
+    # per-key locks so one slow priming LIST doesn't stall lookups of other selectors
+    memo.pod_cache_key_locks: dict[tuple, threading.Lock] = {}
+    # (namespace, name) of each HSD -> the pod cache key it currently reads
+    memo.pod_cache_refs: dict[tuple[str, str], tuple] = {}
+
+    # (namespace, name) -> time.monotonic() of the last finished sync
+    memo.last_sync: dict[tuple[str, str], float] = {}
+
+    # (pod cache key, canonical http_cfg) -> _ProbeState; probed in the background,
+    # read by reconciles. HSDs sharing a selector but not a probe config get their own
+    memo.probes: dict[tuple, "_ProbeState"] = {}
+    # (namespace, name) of each HTTP-mode HSD -> the probe key it currently reads
+    memo.probe_refs: dict[tuple[str, str], tuple] = {}
+    # never have more probes in flight than the pool has connections; excess probes
+    # queue here instead of timing out on pool acquire and reading as idle
+    memo.probe_slots = asyncio.Semaphore(HTTP_MAX_CONNECTIONS)
+    memo.probe_task = asyncio.create_task(_probe_loop(memo))
+
+
+@kopf.on.cleanup()
+async def close_clients(memo: kopf.Memo, **_):
+    memo.probe_task.cancel()
+    await memo.http.aclose()
+    if memo.http2 is not None:
+        await memo.http2.aclose()
+
+
+def _new_http_client(http2: bool = False) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        ),
+        timeout=HTTP_DEFAULTS["timeoutSeconds"],
+        # pod URLs are plain http://, so HTTP/2 means prior knowledge (h2c), no HTTP/1.1
+        http1=not http2,
+        http2=http2,
+    )
+
+
+def _http_client(memo: kopf.Memo, http_cfg: dict) -> httpx.AsyncClient:
+    if http_cfg.get("http2", HTTP_DEFAULTS["http2"]) and memo.http2 is not None:
+        return memo.http2
+    return memo.http
+
 
 def _merge_labels(*dicts: t.Dict[str, str]) -> t.Dict[str, str]:
     out: dict[str, str] = {}
@@ -44,23 +138,171 @@ def _merge_labels(*dicts: t.Dict[str, str]) -> t.Dict[str, str]:
     return out
 
 
-def _pods_by_selector(v1: CoreV1Api, namespace: str, match_labels: dict) -> list[client.V1Pod]:
-    label_sel = ",".join([f"{k}={v}" for k, v in (match_labels or {}).items()])
-    pods = v1.list_namespaced_pod(namespace, label_selector=label_sel).items
+class _PodStore:
+    """In-memory view of the pods matching one selector, kept fresh by a watch."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pods: dict[str, client.V1Pod] = {}
+        self.stopped = threading.Event()
+        self.watch: t.Optional[watch.Watch] = None
+
+    def replace(self, pods: t.Iterable[client.V1Pod]) -> None:
+        fresh = {p.metadata.uid: p for p in pods}
+        with self._lock:
+            self._pods = fresh
+
+    def apply(self, event_type: str, pod: client.V1Pod) -> None:
+        with self._lock:
+            if event_type == "DELETED":
+                self._pods.pop(pod.metadata.uid, None)
+            else:
+                self._pods[pod.metadata.uid] = pod
+
+    def snapshot(self) -> list[client.V1Pod]:
+        with self._lock:
+            return list(self._pods.values())
+
+    def close(self) -> None:
+        # the watch thread exits on its next event or stream timeout
+        self.stopped.set()
+        if self.watch is not None:
+            self.watch.stop()
+
+
+def _list_pods(v1: CoreV1Api, namespace: str, label_sel: str) -> client.V1PodList:
+    # resource_version="0" lets the apiserver answer from its watch cache instead of a
+    # quorum read from etcd; slightly stale counts are fine, the timer re-reconciles anyway
+    return v1.list_namespaced_pod(namespace, label_selector=label_sel, resource_version="0")
+
+
+def _watch_pods(v1: CoreV1Api, store: _PodStore, namespace: str, label_sel: str, resource_version: str) -> None:
+    # explicit return_type: newer clients no longer infer it from the method docstring
+    w = store.watch = watch.Watch(return_type=client.V1Pod)
+    while not store.stopped.is_set():
+        try:
+            for event in w.stream(
+                v1.list_namespaced_pod,
+                namespace,
+                label_selector=label_sel,
+                resource_version=resource_version,
+                timeout_seconds=POD_WATCH_TIMEOUT,
+                _request_timeout=POD_WATCH_REQUEST_TIMEOUT,
+            ):
+                # ERROR events are raised as ApiException by the stream itself
+                pod = event["object"]
+                store.apply(event["type"], pod)
+                resource_version = pod.metadata.resource_version
+        except ApiException as e:
+            if e.status != 410:
+                logger.warning("pod watch %s/%s failed: %s", namespace, label_sel, e)
+                store.stopped.wait(POD_WATCH_BACKOFF)
+            # our resourceVersion is gone (410) or unknown: relist and resume from there
+            try:
+                pods = _list_pods(v1, namespace, label_sel)
+            except Exception as e:
+                logger.warning("pod relist %s/%s failed: %s", namespace, label_sel, e)
+                store.stopped.wait(POD_WATCH_BACKOFF)
+                continue
+            store.replace(pods.items)
+            resource_version = pods.metadata.resource_version
+        except Exception as e:
+            logger.warning("pod watch %s/%s failed: %s", namespace, label_sel, e)
+            store.stopped.wait(POD_WATCH_BACKOFF)
+
+
+@lru_cache(maxsize=256)
+def _label_selector(labels: t.FrozenSet[t.Tuple[str, str]]) -> str:
+    return ",".join(f"{k}={v}" for k, v in sorted(labels))
+
+
+def _pod_cache_key(namespace: str, match_labels: dict, metadata_only: bool) -> tuple:
+    return (namespace, frozenset((match_labels or {}).items()), metadata_only)
+
+
+def _pod_store(memo: kopf.Memo, namespace: str, match_labels: dict, metadata_only: bool) -> _PodStore:
+    key = _pod_cache_key(namespace, match_labels, metadata_only)
+    _, labels, _ = key
+    with memo.pod_cache_lock:
+        store = memo.pod_cache.get(key)
+        if store is not None:
+            return store
+        key_lock = memo.pod_cache_key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with memo.pod_cache_lock:
+            store = memo.pod_cache.get(key)
+        if store is not None:
+            return store
+
+        # first sight of this selector: prime synchronously, then keep it fresh from a watch
+        label_sel = _label_selector(labels)
+        v1 = memo.v1_meta if metadata_only else memo.v1
+        pods = _list_pods(v1, namespace, label_sel)
+        store = _PodStore()
+        store.replace(pods.items)
+        threading.Thread(
+            target=_watch_pods,
+            args=(v1, store, namespace, label_sel, pods.metadata.resource_version),
+            name=f"hsd-pod-watch-{namespace}",
+            daemon=True,
+        ).start()
+        with memo.pod_cache_lock:
+            memo.pod_cache[key] = store
+        return store
+
+
+def _track_pod_cache(memo: kopf.Memo, hsd: tuple[str, str], key: tuple) -> None:
+    prev = memo.pod_cache_refs.get(hsd)
+    memo.pod_cache_refs[hsd] = key
+    if prev is not None and prev != key:
+        # matchLabels or busyProbe.mode changed: the old watch may now be orphaned
+        _release_pod_cache(memo, prev)
+
+
+def _release_pod_cache(memo: kopf.Memo, key: tuple) -> None:
+    if key in memo.pod_cache_refs.values():
+        return
+    with memo.pod_cache_lock:
+        store = memo.pod_cache.pop(key, None)
+        memo.pod_cache_key_locks.pop(key, None)
+    # stop the background loop from probing pods nobody watches anymore
+    for probe_key in [k for k in memo.probes if k[0] == key]:
+        memo.probes.pop(probe_key, None)
+    if store is not None:
+        store.close()
+
+
+def _probe_key(namespace: str, match_labels: dict, http_cfg: dict) -> tuple:
+    return (_pod_cache_key(namespace, match_labels, False), json.dumps(http_cfg, sort_keys=True))
+
+
+def _track_probe_state(memo: kopf.Memo, hsd: tuple[str, str], key: t.Optional[tuple]) -> None:
+    # key is None once the HSD is gone or no longer in http mode
+    prev = memo.probe_refs.pop(hsd, None)
+    if key is not None:
+        memo.probe_refs[hsd] = key
+    if prev is not None and prev != key and prev not in memo.probe_refs.values():
+        memo.probes.pop(prev, None)
+
+
+def _pods_by_selector(
+    memo: kopf.Memo,
+    namespace: str,
+    match_labels: dict,
+    metadata_only: bool = False,
+) -> list[client.V1Pod]:
+    pods = _pod_store(memo, namespace, match_labels, metadata_only).snapshot()
     return [p for p in pods if not p.metadata.deletion_timestamp]
 
 
-def _is_pod_busy_by_annotation(pod: client.V1Pod, ann_key: str) -> bool:
-    anns = pod.metadata.annotations or {}
-    return str(anns.get(ann_key, "false")).lower() == "true"
+def _is_probeable(pod: client.V1Pod) -> bool:
+    # pods without an IP or not yet Running can't be busy; don't open sockets for them
+    return bool(pod.status and pod.status.pod_ip and pod.status.phase == "Running")
 
 
-def _is_pod_busy_by_http(pod: client.V1Pod, http_cfg: dict) -> bool:
-    if not pod.status or not pod.status.pod_ip:
-        return False
-    if pod.status.phase != "Running":
-        return False
-
+async def _is_pod_busy_by_http(pod: client.V1Pod, http_cfg: dict, http: httpx.AsyncClient) -> t.Optional[bool]:
+    # callers only pass pods that passed _is_probeable; None means we got no answer at all
     port = http_cfg.get("port", HTTP_DEFAULTS["port"])
     path = http_cfg.get("path", HTTP_DEFAULTS["path"])
     timeout = http_cfg.get("timeoutSeconds", HTTP_DEFAULTS["timeoutSeconds"])
@@ -68,41 +310,124 @@ def _is_pod_busy_by_http(pod: client.V1Pod, http_cfg: dict) -> bool:
 
     url = f"http://{pod.status.pod_ip}:{port}{path}"
     try:
-        resp = requests.get(url, timeout=timeout)
+        resp = await http.get(url, timeout=timeout)
         ok = 200 <= resp.status_code < 300
         return bool(ok) if success_is_busy else (not ok)
-    except requests.RequestException:
+    except httpx.PoolTimeout:
+        # our own pool was exhausted; says nothing about the pod
+        return None
+    except (httpx.HTTPError, httpx.InvalidURL):
+        # InvalidURL (e.g. a path without a leading slash) is not an HTTPError
         return False
 
 
-def _count_busy_idle(
-    v1: CoreV1Api,
+class _ProbeState:
+    """Last known HTTP busy result per pod for one HTTP-mode selector."""
+
+    def __init__(self, http_cfg: dict) -> None:
+        self.http_cfg = http_cfg
+        self.busy: dict[str, bool] = {}
+        self.probed_at: dict[str, float] = {}
+
+    def prune(self, live_uids: t.AbstractSet[str]) -> None:
+        for uid in self.busy.keys() - live_uids:
+            self.busy.pop(uid, None)
+            self.probed_at.pop(uid, None)
+
+    async def probe(self, pod: client.V1Pod, http: httpx.AsyncClient, slots: asyncio.Semaphore) -> None:
+        uid = pod.metadata.uid
+        async with slots:
+            busy = await _is_pod_busy_by_http(pod, self.http_cfg, http)
+        if busy is None:
+            # keep the last real answer; the pod stays due and is retried next tick
+            return
+        self.busy[uid] = busy
+        self.probed_at[uid] = time.monotonic()
+
+
+async def _probe_due(memo: kopf.Memo) -> None:
+    now = time.monotonic()
+    jobs = []
+    for (cache_key, _), state in list(memo.probes.items()):
+        store = memo.pod_cache.get(cache_key)
+        if store is None:
+            continue
+        pods = [p for p in store.snapshot() if not p.metadata.deletion_timestamp and _is_probeable(p)]
+        state.prune({p.metadata.uid for p in pods})
+        period = state.http_cfg.get("periodSeconds", HTTP_DEFAULTS["periodSeconds"])
+        for p in pods:
+            last = state.probed_at.get(p.metadata.uid)
+            if last is None or now - last >= period:
+                jobs.append(state.probe(p, _http_client(memo, state.http_cfg), memo.probe_slots))
+    if jobs:
+        await asyncio.gather(*jobs)
+
+
+async def _probe_loop(memo: kopf.Memo) -> None:
+    # keeps HTTP busy results fresh at each HSD's periodSeconds, off the reconcile path
+    while True:
+        await asyncio.sleep(PROBE_TICK)
+        try:
+            await _probe_due(memo)
+        except Exception:
+            logger.exception("background busy probe failed")
+
+
+async def _count_busy_idle(
+    memo: kopf.Memo,
     namespace: str,
     match_labels: dict,
     mode: str,
     ann_key: str,
     http_cfg: dict,
 ) -> tuple[int, int]:
-    pods = _pods_by_selector(v1, namespace, match_labels)
-    busy = 0
+    # annotation mode only reads metadata, so skip spec/status on the wire.
+    # off-loop because the first lookup of a selector primes the cache with a LIST
+    pods = await asyncio.to_thread(
+        _pods_by_selector, memo, namespace, match_labels, metadata_only=(mode != "http"),
+    )
     if mode == "http":
-        for p in pods:
-            if _is_pod_busy_by_http(p, http_cfg):
-                busy += 1
+        key = _probe_key(namespace, match_labels, http_cfg)
+        state = memo.probes.get(key)
+        if state is None:
+            state = memo.probes[key] = _ProbeState(http_cfg)
+        probeable = [p for p in pods if _is_probeable(p)]
+        # results come from the background loop; only pods it hasn't reached yet are
+        # probed inline, so a fresh pod is never counted idle just because it's new
+        unseen = [p for p in probeable if p.metadata.uid not in state.busy]
+        if unseen:
+            http = _http_client(memo, http_cfg)
+            await asyncio.gather(*(state.probe(p, http, memo.probe_slots) for p in unseen))
+        busy = sum(state.busy.get(p.metadata.uid, False) for p in probeable)
     else:
-        for p in pods:
-            if _is_pod_busy_by_annotation(p, ann_key):
-                busy += 1
+        busy = sum(1 for p in pods if (p.metadata.annotations or _EMPTY).get(ann_key, "false").lower() == "true")
     idle = max(0, len(pods) - busy)
     return busy, idle
 
 
 def _pod_template_from_spec(pod_template_spec: dict, merged_labels: dict) -> dict:
-    tmpl = deepcopy(pod_template_spec) if pod_template_spec else {"metadata": {}, "spec": {}}
-    meta = tmpl.setdefault("metadata", {})
-    labels = meta.setdefault("labels", {})
-    meta["labels"] = _merge_labels(labels, merged_labels)
-    return tmpl
+    if not pod_template_spec:
+        return {"metadata": {"labels": _merge_labels(merged_labels)}, "spec": {}}
+    # only metadata.labels is rewritten, so copy just that path and share the rest
+    meta = pod_template_spec.get("metadata") or {}
+    return {
+        **pod_template_spec,
+        "metadata": {**meta, "labels": _merge_labels(meta.get("labels"), merged_labels)},
+    }
+
+
+def _is_subset(want: t.Any, have: t.Any) -> bool:
+    # true when every field we set is present with the same value; extra keys on
+    # `have` (apiserver defaults) are ignored
+    if isinstance(want, dict):
+        return isinstance(have, dict) and all(k in have and _is_subset(v, have[k]) for k, v in want.items())
+    if isinstance(want, list):
+        return (
+            isinstance(have, list)
+            and len(want) == len(have)
+            and all(_is_subset(w, h) for w, h in zip(want, have))
+        )
+    return want == have
 
 
 def _ensure_child_deployment(
@@ -115,6 +440,10 @@ def _ensure_child_deployment(
     initial_replicas: int,
 ) -> client.V1Deployment:
     tmpl = _pod_template_from_spec(pod_template_spec, match_labels)
+    desired = {"selector": {"matchLabels": dict(match_labels)}, "template": tmpl}
+    # the hash catches changes to the HSD (including removed fields), the subset check
+    # catches someone editing the child Deployment behind our back
+    spec_hash = hashlib.sha256(json.dumps(desired, sort_keys=True).encode()).hexdigest()
 
     try:
         dep = apps.read_namespaced_deployment(name=name, namespace=namespace)
@@ -134,6 +463,7 @@ def _ensure_child_deployment(
                 "name": name,
                 "namespace": namespace,
                 "labels": {"hsd.paia.tech/name": owner_body["metadata"]["name"]},
+                "annotations": {SPEC_HASH_ANN: spec_hash},
                 "ownerReferences": [{
                     "apiVersion": owner_body["apiVersion"],
                     "kind": owner_body["kind"],
@@ -145,25 +475,25 @@ def _ensure_child_deployment(
             },
             "spec": {
                 "replicas": int(initial_replicas),
-                "selector": {"matchLabels": dict(match_labels)},
-                "template": tmpl,
+                **desired,
             },
         }
-        apps.create_namespaced_deployment(namespace=namespace, body=dep_body)
-        return apps.read_namespaced_deployment(name=name, namespace=namespace)
+        return apps.create_namespaced_deployment(namespace=namespace, body=dep_body)
+
+    live_spec = apps.api_client.sanitize_for_serialization(dep.spec)
+    if (dep.metadata.annotations or {}).get(SPEC_HASH_ANN) == spec_hash and _is_subset(desired, live_spec):
+        return dep
 
     patch_body = {
-        "spec": {
-            "selector": {"matchLabels": dict(match_labels)},
-            "template": tmpl,
-        }
+        "metadata": {"annotations": {SPEC_HASH_ANN: spec_hash}},
+        "spec": desired,
     }
-    apps.patch_namespaced_deployment(name=name, namespace=namespace, body=patch_body)
-    return apps.read_namespaced_deployment(name=name, namespace=namespace)
+    return apps.patch_namespaced_deployment(name=name, namespace=namespace, body=patch_body)
 
 
 def _scale_deployment(apps: AppsV1Api, name: str, namespace: str, replicas: int) -> None:
-    apps.patch_namespaced_deployment(
+    # /scale skips template diffing and the controller's template-hash re-evaluation
+    apps.patch_namespaced_deployment_scale(
         name=name,
         namespace=namespace,
         body={"spec": {"replicas": int(replicas)}},
@@ -179,15 +509,16 @@ def _get_probe_conf(spec: dict) -> tuple[str, str, dict]:
 
 
 def _desired_replicas(busy: int, idle_target: int, min_r: t.Optional[int], max_r: t.Optional[int]) -> int:
-    desired = int(busy) + int(idle_target)
+    # inputs are already ints: _sync_once coerces the spec once when it reads it
+    desired = busy + idle_target
     if min_r is not None:
-        desired = max(desired, int(min_r))
+        desired = max(desired, min_r)
     if max_r is not None:
-        desired = min(desired, int(max_r))
+        desired = min(desired, max_r)
     return desired
 
 
-def _sync_once(
+async def _sync_once(
     memo: kopf.Memo,
     body: dict,
     spec: dict,
@@ -212,7 +543,8 @@ def _sync_once(
 
     # ensure child deployment
     initial = idle_target if (min_r is None) else max(idle_target, min_r)
-    dep = _ensure_child_deployment(
+    dep = await asyncio.to_thread(
+        _ensure_child_deployment,
         apps=memo.apps,
         owner_body=body,
         name=dep_name,
@@ -223,8 +555,10 @@ def _sync_once(
     )
 
     # busy / idle
-    busy, idle = _count_busy_idle(
-        v1=memo.v1,
+    _track_pod_cache(memo, (namespace, name), _pod_cache_key(namespace, selector, mode != "http"))
+    _track_probe_state(memo, (namespace, name), _probe_key(namespace, selector, http_cfg) if mode == "http" else None)
+    busy, idle = await _count_busy_idle(
+        memo=memo,
         namespace=namespace,
         match_labels=selector,
         mode=mode,
@@ -236,27 +570,67 @@ def _sync_once(
     cur = int(dep.spec.replicas or 0)
     desired = _desired_replicas(busy, idle_target, min_r, max_r)
     if cur != desired:
-        _scale_deployment(memo.apps, dep_name, namespace, desired)
+        await asyncio.to_thread(_scale_deployment, memo.apps, dep_name, namespace, desired)
+
+    memo.last_sync[(namespace, name)] = time.monotonic()
 
     # status
     return {
-        "busyCount": int(busy),
-        "idleCount": int(idle),
-        "desiredReplicas": int(desired),
+        "busyCount": busy,
+        "idleCount": idle,
+        "desiredReplicas": desired,
         "observedGeneration": int(meta.get("generation", 0)),
     }
 
+
+def _patch_status(patch: kopf.Patch, old: dict, new: dict) -> None:
+    # write the top-level status fields (what the CRD schema and printer columns expect);
+    # only changed keys go out, and with none changed kopf sends no status PATCH at all
+    for k, v in new.items():
+        if old.get(k) != v:
+            patch.status[k] = v
+
+
+def _debounce_wait(memo: kopf.Memo, meta: dict) -> float:
+    last = memo.last_sync.get((meta["namespace"], meta["name"]))
+    if last is None:
+        return 0.0
+    return RECONCILE_DEBOUNCE - (time.monotonic() - last)
+
+
 @kopf.on.create(GROUP, VERSION, PLURAL)
 @kopf.on.update(GROUP, VERSION, PLURAL)
 @kopf.on.resume(GROUP, VERSION, PLURAL)
-def reconcile(spec, status, meta, body, memo: kopf.Memo, **_):
-    return _sync_once(memo, body, spec, status or {}, meta)
+async def reconcile(spec, status, meta, body, patch: kopf.Patch, memo: kopf.Memo, **_):
+    # bursts are already coalesced by settings.batching.batch_window, and kopf runs
+    # one handler at a time per object, so spec changes are applied right away
+    status = status or {}
+    result = await _sync_once(memo, body, spec, status, meta)
+    _patch_status(patch, status, result)
 
 
 @kopf.timer(GROUP, VERSION, PLURAL, interval=10.0)
-def periodic(spec, status, meta, body, memo: kopf.Memo, **_):
+async def periodic(spec, status, meta, body, patch: kopf.Patch, memo: kopf.Memo, **_):
+    if _debounce_wait(memo, meta) > 0:
+        return None
+    status = status or {}
     try:
-        return _sync_once(memo, body, spec, status or {}, meta)
+        result = await _sync_once(memo, body, spec, status, meta)
     except Exception as e:
         kopf.info(body, reason="ReconcileError", message=f"timer reconcile failed: {e}")
         return None
+    _patch_status(patch, status, result)
+
+
+@kopf.on.delete(GROUP, VERSION, PLURAL, optional=True)
+async def forget(meta, memo: kopf.Memo, **_):
+    # drop per-HSD state and stop watches nobody else reads; the child Deployment
+    # goes away through its ownerReference.
+    # optional=True alone would add no finalizer and could miss the deletion; this runs
+    # reliably only because the @kopf.timer above makes kopf add its finalizer anyway
+    hsd = (meta["namespace"], meta["name"])
+    memo.last_sync.pop(hsd, None)
+    _track_probe_state(memo, hsd, None)
+    key = memo.pod_cache_refs.pop(hsd, None)
+    if key is not None:
+        _release_pod_cache(memo, key)